@@ -1,12 +1,21 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from types import MappingProxyType
 from uuid import uuid4
 import time
+import json
+import itertools
+import functools
 import logging
 import os
 from dotenv import load_dotenv
+from openai import AsyncOpenAI
 
 # Load environment variables
 load_dotenv()
@@ -18,6 +27,7 @@ from main import (
     landlord_services_agent,
     hps_agent,
     create_initial_context,
+    HousingAuthorityContext,
 )
 
 from agents import (
@@ -29,16 +39,25 @@ from agents import (
     ToolCallOutputItem,
     InputGuardrailTripwireTriggered,
     Handoff,
+    set_default_openai_client,
 )
 
 # Configure logging
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Share one OpenAI client (and its connection pool) across all agent runs."""
+    openai_client = AsyncOpenAI()
+    set_default_openai_client(openai_client)
+    yield
+    await openai_client.close()
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/health")
-async def health_check():
+async def health_check() -> Dict[str, str]:
     return {"status": "ok"}
 
 # CORS configuration (adjust as needed for deployment)
@@ -58,6 +77,10 @@ class ChatRequest(BaseModel):
     conversation_id: Optional[str] = None
     message: str
 
+# MessageResponse, AgentEvent and GuardrailCheck are only built server-side from
+# trusted run data, so the endpoint creates them with model_construct() to
+# skip field validation.
+
 class MessageResponse(BaseModel):
     content: str
     agent: str
@@ -87,43 +110,88 @@ class ChatResponse(BaseModel):
     agents: List[Dict[str, Any]]
     guardrails: List[GuardrailCheck] = []
 
+class StreamError(BaseModel):
+    conversation_id: str
+    detail: str
+
 # =========================
 # In-memory store for conversation state
 # =========================
 
+@dataclass(slots=True)
+class ConversationState:
+    """Per-conversation state kept between turns."""
+    input_items: List[Dict[str, Any]]
+    context: HousingAuthorityContext
+    current_agent: str
+
 class ConversationStore:
-    def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+    def get(self, conversation_id: str) -> Optional[ConversationState]:
         pass
 
-    def save(self, conversation_id: str, state: Dict[str, Any]):
+    def save(self, conversation_id: str, state: ConversationState):
         pass
 
 class InMemoryConversationStore(ConversationStore):
-    _conversations: Dict[str, Dict[str, Any]] = {}
+    """LRU-bounded store: the least recently used conversation is evicted once full."""
 
-    def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
-        return self._conversations.get(conversation_id)
+    def __init__(self, max_conversations: int = 10_000):
+        self._conversations: "OrderedDict[str, ConversationState]" = OrderedDict()
+        self._max_conversations = max_conversations
 
-    def save(self, conversation_id: str, state: Dict[str, Any]):
+    def get(self, conversation_id: str) -> Optional[ConversationState]:
+        state = self._conversations.get(conversation_id)
+        if state is not None:
+            self._conversations.move_to_end(conversation_id)
+        return state
+
+    def save(self, conversation_id: str, state: ConversationState):
         self._conversations[conversation_id] = state
+        self._conversations.move_to_end(conversation_id)
+        while len(self._conversations) > self._max_conversations:
+            self._conversations.popitem(last=False)
+
+# Older turns beyond this many input items are dropped from the history sent to the model
+MAX_HISTORY_ITEMS = int(os.getenv("MAX_HISTORY_ITEMS", "50"))
 
 # TODO: when deploying this app in scale, switch to your own production-ready implementation
-conversation_store = InMemoryConversationStore()
+conversation_store = InMemoryConversationStore(
+    max_conversations=int(os.getenv("MAX_CONVERSATIONS", "10000"))
+)
 
 # =========================
 # Helpers
 # =========================
 
+_AGENTS_BY_NAME = MappingProxyType({
+    agent.name: agent
+    for agent in (
+        triage_agent,
+        general_info_agent,
+        inspection_agent,
+        landlord_services_agent,
+        hps_agent,
+    )
+})
+
 def _get_agent_by_name(name: str):
-    """Return the agent object by name."""
-    agents = {
-        triage_agent.name: triage_agent,
-        general_info_agent.name: general_info_agent,
-        inspection_agent.name: inspection_agent,
-        landlord_services_agent.name: landlord_services_agent,
-        hps_agent.name: hps_agent,
-    }
-    return agents.get(name, triage_agent)
+    """Return the agent object by name, restarting at triage for unknown names."""
+    try:
+        return _AGENTS_BY_NAME[name]
+    except KeyError:
+        logger.warning("Unknown agent %r in conversation state; resetting to %s", name, triage_agent.name)
+        return triage_agent
+
+# Streamed runs send each item to the client as soon as it is produced. With the
+# default parallel input guardrails the model and its tools could run (and their
+# output reach the client) before a guardrail trips, so /chat/stream starts its
+# runs from copies of the agents whose input guardrails finish first.
+_STREAMING_AGENTS_BY_NAME = MappingProxyType({
+    name: agent.clone(
+        input_guardrails=[replace(g, run_in_parallel=False) for g in agent.input_guardrails]
+    )
+    for name, agent in _AGENTS_BY_NAME.items()
+})
 
 def _get_guardrail_name(g) -> str:
     """Extract a friendly guardrail name."""
@@ -156,171 +224,226 @@ def _build_agents_list() -> List[Dict[str, Any]]:
         make_agent_dict(hps_agent),
     ]
 
+# Agents and their handoffs/tools/guardrails are fixed at import time,
+# so the list sent with every response only needs to be built once.
+_AGENTS_LIST: List[Dict[str, Any]] = _build_agents_list()
+
+def _handoff_callback_name(ho: Handoff) -> Optional[str]:
+    """Return the name of the on_handoff callback captured by a Handoff, if any."""
+    # Handoff does not expose the callback; it is only reachable through the
+    # closure of on_invoke_handoff (which newer SDKs wrap in a partial).
+    candidates = [ho.on_invoke_handoff]
+    while candidates:
+        fn = candidates.pop()
+        if isinstance(fn, functools.partial):
+            candidates.extend([fn.func, *fn.args])
+            continue
+        code = getattr(fn, "__code__", None)
+        if code is None or "on_handoff" not in code.co_freevars:
+            continue
+        idx = code.co_freevars.index("on_handoff")
+        cl = fn.__closure__ or []
+        if idx < len(cl) and cl[idx].cell_contents:
+            cb = cl[idx].cell_contents
+            return getattr(cb, "__name__", repr(cb))
+    return None
+
+# (source agent, target agent) -> on_handoff callback name, resolved once
+# instead of introspecting closures on every handoff event.
+_HANDOFF_CALLBACK_NAMES: Dict[tuple, str] = {
+    (agent.name, h.agent_name): cb_name
+    for agent in _AGENTS_BY_NAME.values()
+    for h in getattr(agent, "handoffs", [])
+    if isinstance(h, Handoff) and (cb_name := _handoff_callback_name(h))
+}
+
 # =========================
-# Main Chat Endpoint
+# Chat turn helpers
 # =========================
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat_endpoint(req: ChatRequest):
-    """
-    Main chat endpoint for agent orchestration.
-    Handles conversation state, agent routing, and guardrail checks.
+def _make_id_factory():
+    """Return a callable producing ids unique within (and across) responses.
+
+    Event/guardrail ids only need to be unique, not random: draw one uuid
+    per request and number the items within it.
     """
-    # Initialize or retrieve conversation state
-    is_new = not req.conversation_id or conversation_store.get(req.conversation_id) is None
-    if is_new:
-        conversation_id: str = uuid4().hex
-        ctx = create_initial_context()
-        current_agent_name = triage_agent.name
-        state: Dict[str, Any] = {
-            "input_items": [],
-            "context": ctx,
-            "current_agent": current_agent_name,
-        }
-        if req.message.strip() == "":
-            conversation_store.save(conversation_id, state)
-            return ChatResponse(
-                conversation_id=conversation_id,
-                current_agent=current_agent_name,
-                messages=[],
-                events=[],
-                context=ctx.model_dump(),
-                agents=_build_agents_list(),
-                guardrails=[],
-            )
-    else:
-        conversation_id = req.conversation_id  # type: ignore
-        state = conversation_store.get(conversation_id)
+    id_prefix = uuid4().hex
+    id_counter = itertools.count()
+
+    def next_id() -> str:
+        return f"{id_prefix}-{next(id_counter)}"
+
+    return next_id
+
+def _load_conversation(req: ChatRequest):
+    """Return (conversation_id, state, is_new) for the request."""
+    state = conversation_store.get(req.conversation_id) if req.conversation_id else None
+    if state is not None:
+        return req.conversation_id, state, False
+    state = ConversationState(
+        input_items=[],
+        context=create_initial_context(),
+        current_agent=triage_agent.name,
+    )
+    return uuid4().hex, state, True
+
+def _make_chat_response(
+    conversation_id: str,
+    agent_name: str,
+    messages: List[MessageResponse],
+    events: List[AgentEvent],
+    context: Dict[str, Any],
+    guardrails: List[GuardrailCheck],
+) -> ChatResponse:
+    """Assemble a ChatResponse from an already-dumped context."""
+    return ChatResponse(
+        conversation_id=conversation_id,
+        current_agent=agent_name,
+        messages=messages,
+        events=events,
+        context=context,
+        agents=_AGENTS_LIST,
+        guardrails=guardrails,
+    )
 
-    current_agent = _get_agent_by_name(state["current_agent"])
-    state["input_items"].append({"content": req.message, "role": "user"})
-    old_context = state["context"].model_dump().copy()
-    guardrail_checks: List[GuardrailCheck] = []
+def _empty_chat_response(conversation_id: str, state: ConversationState) -> ChatResponse:
+    """Response for a freshly created conversation with no user message yet."""
+    return _make_chat_response(
+        conversation_id, state.current_agent, [], [], state.context.to_dict(), []
+    )
 
-    try:
-        result = await Runner.run(current_agent, state["input_items"], context=state["context"])
-    except InputGuardrailTripwireTriggered as e:
-        failed = e.guardrail_result.guardrail
-        gr_output = e.guardrail_result.output.output_info
-        gr_reasoning = getattr(gr_output, "reasoning", "")
-        gr_input = req.message
-        gr_timestamp = time.time() * 1000
-        for g in current_agent.input_guardrails:
-            guardrail_checks.append(GuardrailCheck(
-                id=uuid4().hex,
-                name=_get_guardrail_name(g),
-                input=gr_input,
-                reasoning=(gr_reasoning if g == failed else ""),
-                passed=(g != failed),
-                timestamp=gr_timestamp,
-            ))
-        # Check if this is a data privacy guardrail failure (income information)
-        if _get_guardrail_name(failed) == "Data Privacy Guardrail":
-            refusal = "For your security and privacy, please do not share social security numbers, bank account numbers, credit card information, or other sensitive personal identification through this chat system.\n\nFor sharing sensitive documents or personal identification, please contact your Housing Choice Voucher Program (HPS) specialist or caseworker directly:\n\nEmail: customerservice@smchousing.org\n\nHousing Authority Office Hours:\nMonday through Friday, 8:00 AM to 5:00 PM\nClosed weekends and holidays"
-        else:
-            refusal = "Sorry, I can only answer questions related to housing authority services.\n\nFor other inquiries, please send a detailed email to customerservice@smchousing.org and an HPS or housing authority specialist will be in contact with you.\n\nHousing Authority Office Hours:\nMonday through Friday, 8:00 AM to 5:00 PM\nClosed weekends and holidays"
-        state["input_items"].append({"role": "assistant", "content": refusal})
-        return ChatResponse(
-            conversation_id=conversation_id,
-            current_agent=current_agent.name,
-            messages=[MessageResponse(content=refusal, agent=current_agent.name)],
-            events=[],
-            context=state["context"].model_dump(),
-            agents=_build_agents_list(),
-            guardrails=guardrail_checks,
+def _tripwire_response(
+    e: InputGuardrailTripwireTriggered,
+    conversation_id: str,
+    state: ConversationState,
+    current_agent,
+    message: str,
+    next_id,
+) -> ChatResponse:
+    """Record a refusal for a tripped input guardrail and build its response."""
+    failed = e.guardrail_result.guardrail
+    gr_output = e.guardrail_result.output.output_info
+    gr_reasoning = getattr(gr_output, "reasoning", "")
+    gr_timestamp = time.time() * 1000
+    guardrail_checks = [
+        GuardrailCheck.model_construct(
+            id=next_id(),
+            name=_get_guardrail_name(g),
+            input=message,
+            reasoning=(gr_reasoning if g == failed else ""),
+            passed=(g != failed),
+            timestamp=gr_timestamp,
         )
+        for g in current_agent.input_guardrails
+    ]
+    # Check if this is a data privacy guardrail failure (income information)
+    if _get_guardrail_name(failed) == "Data Privacy Guardrail":
+        refusal = "For your security and privacy, please do not share social security numbers, bank account numbers, credit card information, or other sensitive personal identification through this chat system.\n\nFor sharing sensitive documents or personal identification, please contact your Housing Choice Voucher Program (HPS) specialist or caseworker directly:\n\nEmail: customerservice@smchousing.org\n\nHousing Authority Office Hours:\nMonday through Friday, 8:00 AM to 5:00 PM\nClosed weekends and holidays"
+    else:
+        refusal = "Sorry, I can only answer questions related to housing authority services.\n\nFor other inquiries, please send a detailed email to customerservice@smchousing.org and an HPS or housing authority specialist will be in contact with you.\n\nHousing Authority Office Hours:\nMonday through Friday, 8:00 AM to 5:00 PM\nClosed weekends and holidays"
+    state.input_items.append({"role": "assistant", "content": refusal})
+    # Dump the context again rather than reusing the pre-run snapshot: guardrails
+    # that passed (e.g. language support) may already have updated it.
+    return _make_chat_response(
+        conversation_id,
+        current_agent.name,
+        [MessageResponse.model_construct(content=refusal, agent=current_agent.name)],
+        [],
+        state.context.to_dict(),
+        guardrail_checks,
+    )
 
+def _item_to_responses(item, next_id):
+    """Convert one run item into the messages and events shown in the UI."""
     messages: List[MessageResponse] = []
     events: List[AgentEvent] = []
 
-    for item in result.new_items:
-        if isinstance(item, MessageOutputItem):
-            text = ItemHelpers.text_message_output(item)
-            messages.append(MessageResponse(content=text, agent=item.agent.name))
-            events.append(AgentEvent(id=uuid4().hex, type="message", agent=item.agent.name, content=text))
-        # Handle handoff output and agent switching
-        elif isinstance(item, HandoffOutputItem):
-            # Record the handoff event
-            events.append(
-                AgentEvent(
-                    id=uuid4().hex,
-                    type="handoff",
-                    agent=item.source_agent.name,
-                    content=f"{item.source_agent.name} -> {item.target_agent.name}",
-                    metadata={"source_agent": item.source_agent.name, "target_agent": item.target_agent.name},
-                )
-            )
-            # If there is an on_handoff callback defined for this handoff, show it as a tool call
-            from_agent = item.source_agent
-            to_agent = item.target_agent
-            # Find the Handoff object on the source agent matching the target
-            ho = next(
-                (h for h in getattr(from_agent, "handoffs", [])
-                 if isinstance(h, Handoff) and getattr(h, "agent_name", None) == to_agent.name),
-                None,
+    if isinstance(item, MessageOutputItem):
+        text = ItemHelpers.text_message_output(item)
+        messages.append(MessageResponse.model_construct(content=text, agent=item.agent.name))
+        events.append(AgentEvent.model_construct(id=next_id(), type="message", agent=item.agent.name, content=text))
+    # Handle handoff output and agent switching
+    elif isinstance(item, HandoffOutputItem):
+        # Record the handoff event
+        events.append(
+            AgentEvent.model_construct(
+                id=next_id(),
+                type="handoff",
+                agent=item.source_agent.name,
+                content=f"{item.source_agent.name} -> {item.target_agent.name}",
+                metadata={"source_agent": item.source_agent.name, "target_agent": item.target_agent.name},
             )
-            if ho:
-                fn = ho.on_invoke_handoff
-                fv = fn.__code__.co_freevars
-                cl = fn.__closure__ or []
-                if "on_handoff" in fv:
-                    idx = fv.index("on_handoff")
-                    if idx < len(cl) and cl[idx].cell_contents:
-                        cb = cl[idx].cell_contents
-                        cb_name = getattr(cb, "__name__", repr(cb))
-                        events.append(
-                            AgentEvent(
-                                id=uuid4().hex,
-                                type="tool_call",
-                                agent=to_agent.name,
-                                content=cb_name,
-                            )
-                        )
-            current_agent = item.target_agent
-        elif isinstance(item, ToolCallItem):
-            tool_name = getattr(item.raw_item, "name", None)
-            raw_args = getattr(item.raw_item, "arguments", None)
-            tool_args: Any = raw_args
-            if isinstance(raw_args, str):
-                try:
-                    import json
-                    tool_args = json.loads(raw_args)
-                except Exception:
-                    pass
+        )
+        # If there is an on_handoff callback defined for this handoff, show it as a tool call
+        cb_name = _HANDOFF_CALLBACK_NAMES.get((item.source_agent.name, item.target_agent.name))
+        if cb_name:
             events.append(
-                AgentEvent(
-                    id=uuid4().hex,
+                AgentEvent.model_construct(
+                    id=next_id(),
                     type="tool_call",
-                    agent=item.agent.name,
-                    content=tool_name or "",
-                    metadata={"tool_args": tool_args},
+                    agent=item.target_agent.name,
+                    content=cb_name,
                 )
             )
-            # If the tool is display_seat_map, send a special message so the UI can render the seat selector.
-            if tool_name == "display_seat_map":
-                messages.append(
-                    MessageResponse(
-                        content="DISPLAY_SEAT_MAP",
-                        agent=item.agent.name,
-                    )
-                )
-        elif isinstance(item, ToolCallOutputItem):
-            events.append(
-                AgentEvent(
-                    id=uuid4().hex,
-                    type="tool_output",
+    elif isinstance(item, ToolCallItem):
+        tool_name = getattr(item.raw_item, "name", None)
+        raw_args = getattr(item.raw_item, "arguments", None)
+        tool_args: Any = raw_args
+        if isinstance(raw_args, str):
+            try:
+                tool_args = json.loads(raw_args)
+            except json.JSONDecodeError:
+                pass
+        events.append(
+            AgentEvent.model_construct(
+                id=next_id(),
+                type="tool_call",
+                agent=item.agent.name,
+                content=tool_name or "",
+                metadata={"tool_args": tool_args},
+            )
+        )
+        # If the tool is display_seat_map, send a special message so the UI can render the seat selector.
+        if tool_name == "display_seat_map":
+            messages.append(
+                MessageResponse.model_construct(
+                    content="DISPLAY_SEAT_MAP",
                     agent=item.agent.name,
-                    content=str(item.output),
-                    metadata={"tool_result": item.output},
                 )
             )
+    elif isinstance(item, ToolCallOutputItem):
+        events.append(
+            AgentEvent.model_construct(
+                id=next_id(),
+                type="tool_output",
+                agent=item.agent.name,
+                content=str(item.output),
+                metadata={"tool_result": item.output},
+            )
+        )
 
-    new_context = state["context"].model_dump()
-    changes = {k: new_context[k] for k in new_context if old_context.get(k) != new_context[k]}
-    if changes:
+    return messages, events
+
+def _finish_turn(
+    result,
+    conversation_id: str,
+    state: ConversationState,
+    current_agent,
+    old_context: Dict[str, Any],
+    message: str,
+    messages: List[MessageResponse],
+    events: List[AgentEvent],
+    next_id,
+) -> ChatResponse:
+    """Record context changes, persist the conversation and build the response."""
+    new_context = state.context.to_dict()
+    # Most turns leave the context untouched; a single C-level dict compare
+    # settles that before walking the fields.
+    if new_context != old_context:
+        changes = {k: v for k, v in new_context.items() if old_context[k] != v}
         events.append(
-            AgentEvent(
-                id=uuid4().hex,
+            AgentEvent.model_construct(
+                id=next_id(),
                 type="context_update",
                 agent=current_agent.name,
                 content="",
@@ -328,33 +451,138 @@ async def chat_endpoint(req: ChatRequest):
             )
         )
 
-    state["input_items"] = result.to_input_list()
-    state["current_agent"] = current_agent.name
+    state.input_items = _trim_history(result.to_input_list(), MAX_HISTORY_ITEMS)
+    state.current_agent = current_agent.name
     conversation_store.save(conversation_id, state)
 
-    # Build guardrail results: mark failures (if any), and any others as passed
-    final_guardrails: List[GuardrailCheck] = []
-    for g in getattr(current_agent, "input_guardrails", []):
-        name = _get_guardrail_name(g)
-        failed = next((gc for gc in guardrail_checks if gc.name == name), None)
-        if failed:
-            final_guardrails.append(failed)
-        else:
-            final_guardrails.append(GuardrailCheck(
-                id=uuid4().hex,
-                name=name,
-                input=req.message,
-                reasoning="",
-                passed=True,
-                timestamp=time.time() * 1000,
-            ))
+    # Build guardrail results: every guardrail on the agent passed this turn
+    gr_timestamp = time.time() * 1000
+    final_guardrails = [
+        GuardrailCheck.model_construct(
+            id=next_id(),
+            name=_get_guardrail_name(g),
+            input=message,
+            reasoning="",
+            passed=True,
+            timestamp=gr_timestamp,
+        )
+        for g in getattr(current_agent, "input_guardrails", [])
+    ]
 
-    return ChatResponse(
-        conversation_id=conversation_id,
-        current_agent=current_agent.name,
-        messages=messages,
-        events=events,
-        context=state["context"].model_dump(),
-        agents=_build_agents_list(),
-        guardrails=final_guardrails,
+    return _make_chat_response(
+        conversation_id, current_agent.name, messages, events, new_context, final_guardrails
     )
+
+def _trim_history(items: List[Dict[str, Any]], max_items: int) -> List[Dict[str, Any]]:
+    """Keep roughly the last max_items input items, cutting only at a user message.
+
+    Cutting elsewhere could separate a tool call from its output, which the
+    model API rejects.
+    """
+    if len(items) <= max_items:
+        return items
+    for start in range(len(items) - max_items, len(items)):
+        if items[start].get("role") == "user":
+            return items[start:]
+    return items
+
+def _sse(event: str, payload: BaseModel) -> str:
+    """Format a model as a server-sent event."""
+    return f"event: {event}\ndata: {payload.model_dump_json()}\n\n"
+
+# =========================
+# Main Chat Endpoint
+# =========================
+
+@app.post("/chat", response_model=ChatResponse)
+async def chat_endpoint(req: ChatRequest):
+    """
+    Main chat endpoint for agent orchestration.
+    Handles conversation state, agent routing, and guardrail checks.
+    """
+    conversation_id, state, is_new = _load_conversation(req)
+    if is_new and req.message.strip() == "":
+        conversation_store.save(conversation_id, state)
+        return _empty_chat_response(conversation_id, state)
+
+    current_agent = _get_agent_by_name(state.current_agent)
+    state.input_items.append({"content": req.message, "role": "user"})
+    old_context = state.context.to_dict()
+    next_id = _make_id_factory()
+
+    try:
+        result = await Runner.run(current_agent, state.input_items, context=state.context)
+    except InputGuardrailTripwireTriggered as e:
+        return _tripwire_response(e, conversation_id, state, current_agent, req.message, next_id)
+
+    messages: List[MessageResponse] = []
+    events: List[AgentEvent] = []
+
+    for item in result.new_items:
+        item_messages, item_events = _item_to_responses(item, next_id)
+        messages.extend(item_messages)
+        events.extend(item_events)
+        if isinstance(item, HandoffOutputItem):
+            current_agent = item.target_agent
+
+    return _finish_turn(
+        result, conversation_id, state, current_agent, old_context, req.message, messages, events, next_id
+    )
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(req: ChatRequest):
+    """
+    Streaming variant of /chat.
+    Emits each message and agent event as a server-sent event as soon as the
+    run produces it, then a final "done" event carrying the full ChatResponse,
+    or an "error" event if the run fails. Input guardrails finish before the
+    agent starts, so a tripped guardrail never streams partial output.
+    """
+    conversation_id, state, is_new = _load_conversation(req)
+    if is_new and req.message.strip() == "":
+        conversation_store.save(conversation_id, state)
+        response = _empty_chat_response(conversation_id, state)
+        return StreamingResponse(iter([_sse("done", response)]), media_type="text/event-stream")
+
+    current_agent = _STREAMING_AGENTS_BY_NAME[_get_agent_by_name(state.current_agent).name]
+    state.input_items.append({"content": req.message, "role": "user"})
+    old_context = state.context.to_dict()
+    next_id = _make_id_factory()
+
+    async def event_stream():
+        agent = current_agent
+        messages: List[MessageResponse] = []
+        events: List[AgentEvent] = []
+        result = Runner.run_streamed(agent, state.input_items, context=state.context)
+        try:
+            async for stream_event in result.stream_events():
+                if stream_event.type != "run_item_stream_event":
+                    continue
+                item = stream_event.item
+                item_messages, item_events = _item_to_responses(item, next_id)
+                if isinstance(item, HandoffOutputItem):
+                    agent = item.target_agent
+                for m in item_messages:
+                    yield _sse("message", m)
+                for ev in item_events:
+                    yield _sse("event", ev)
+                messages.extend(item_messages)
+                events.extend(item_events)
+        except InputGuardrailTripwireTriggered as e:
+            yield _sse("done", _tripwire_response(e, conversation_id, state, current_agent, req.message, next_id))
+            return
+        except Exception:
+            # The 200 headers are already sent, so report the failure in-band
+            # instead of ending the stream without a terminal event.
+            logger.exception("Streamed run failed for conversation %s", conversation_id)
+            yield _sse("error", StreamError(
+                conversation_id=conversation_id,
+                detail="An error occurred while processing your message. Please try again.",
+            ))
+            return
+
+        yield _sse("done", _finish_turn(
+            result, conversation_id, state, agent, old_context, req.message, messages, events, next_id
+        ))
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
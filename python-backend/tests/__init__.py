@@ -0,0 +1 @@
+# Backend unit tests; run with `python -m unittest discover tests` from python-backend
@@ -0,0 +1,27 @@
+import json
+import unittest
+
+from agents.tool_context import ToolContext
+
+import main
+
+
+async def _invoke(tool, context: main.HousingAuthorityContext, **arguments) -> str:
+    payload = json.dumps(arguments)
+    tool_context = ToolContext(
+        context=context, tool_name=tool.name, tool_call_id="call_1", tool_arguments=payload
+    )
+    return await tool.on_invoke_tool(tool_context, payload)
+
+
+class ParseRescheduleInfoTests(unittest.IsolatedAsyncioTestCase):
+    async def test_t_code_separators_are_stripped(self):
+        for user_input in ["T12345", "t-12345", "T 12345", "T\n12345", "T\u00a012345"]:
+            with self.subTest(user_input=user_input):
+                context = main.HousingAuthorityContext()
+                await _invoke(main.parse_reschedule_info, context, user_input=user_input)
+                self.assertEqual(context.t_code, "T12345")
+
+
+if __name__ == "__main__":
+    unittest.main()